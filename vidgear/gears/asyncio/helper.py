@@ -33,6 +33,7 @@ import logging as log
 import platform
 import requests
 from tqdm import tqdm
+from functools import partial
 from colorlog import ColoredFormatter
 from pkg_resources import parse_version
 from requests.adapters import HTTPAdapter
@@ -204,8 +205,15 @@ async def reducer(frame=None, percentage=0):
     # construct the dimensions
     dimensions = (int(reduction), int(height * ratio))
 
+    # resize the frame in default executor to keep the event loop unblocked
+    # (OpenCV releases the GIL during resize)
+    resized_frame = await asyncio.get_event_loop().run_in_executor(
+        None,
+        partial(cv2.resize, frame, dimensions, interpolation=cv2.INTER_AREA),
+    )
+
     # return the resized frame
-    return cv2.resize(frame, dimensions, interpolation=cv2.INTER_LANCZOS4)
+    return resized_frame
 
 
 def generate_webdata(path, c_name="webgear", overwrite_default=False, logging=False):
@@ -644,7 +644,7 @@ def reducer(frame=None, percentage=0):
     dimensions = (int(reduction), int(height * ratio))
 
     # return the resized frame
-    return cv2.resize(frame, dimensions, interpolation=cv2.INTER_LANCZOS4)
+    return cv2.resize(frame, dimensions, interpolation=cv2.INTER_AREA)
 
 
 def dict2Args(param_dict):
@@ -24,6 +24,7 @@ import cv2
 import sys
 import time
 import difflib
+import numpy as np
 import logging as log
 import subprocess as sp
 from tqdm import tqdm
@@ -340,9 +341,10 @@ class StreamGear:
             # Check status of the process
             assert self.__process is not None
 
-        # write the frame to pipeline
+        # write the frame's buffer directly to pipeline
+        # (no intermediate bytes copy, unless frame isn't C-contiguous)
         try:
-            self.__process.stdin.write(frame.tostring())
+            self.__process.stdin.write(np.ascontiguousarray(frame))
         except (OSError, IOError):
             # log something is wrong!
             logger.error(
@@ -22,6 +22,7 @@ limitations under the License.
 import sys
 import numpy as np
 import pytest
+import asyncio
 import logging as log
 
 from vidgear.gears.asyncio.helper import reducer, create_blank_frame, logger_handler
@@ -33,11 +34,36 @@ logger.addHandler(logger_handler())
 logger.setLevel(log.DEBUG)
 
 
+# pre-built deterministic noise frame, shared by all tests
+_NOISE = np.random.default_rng(0).integers(0, 256, (500, 800, 3), dtype=np.uint8)
+# guard shared frame against accidental in-place modifications
+_NOISE.flags.writeable = False
+
+
 def getframe():
     """
-    returns empty numpy frame/array of dimensions: (500,800,3)
+    returns shared noise numpy frame/array of dimensions: (500,800,3)
+    """
+    return _NOISE
+
+
+@pytest.fixture
+def event_loop():
+    """
+    creates an instance of uvloop event loop(if available) for each test case
     """
-    return (np.random.standard_normal([500, 800, 3]) * 255).astype(np.uint8)
+    # Note: uvloop comes with `vidgear[asyncio]` on Linux/MacOS, so this fixture
+    # runs on CI with python 3.6/3.7(where these tests are not skipped).
+    try:
+        # import library
+        import uvloop
+
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        # fallback to default event loop
+        loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
 
 
 pytestmark = pytest.mark.asyncio
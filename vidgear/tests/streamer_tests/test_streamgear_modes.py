@@ -21,15 +21,19 @@ limitations under the License.
 
 import os
 import cv2
-import queue
+import json
+import shutil
 import pytest
 import logging as log
 import platform
 import tempfile
 import subprocess
-from mpegdash.parser import MPEGDASHParser
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from functools import lru_cache
+from collections import namedtuple
 
-from vidgear.gears import CamGear, StreamGear
+from vidgear.gears import StreamGear
 from vidgear.gears.helper import logger_handler
 
 # define test logger
@@ -41,6 +45,14 @@ logger.setLevel(log.DEBUG)
 # define machine os
 _windows = True if os.name == "nt" else False
 
+# define test videos base path
+_TESTVIDS = Path(tempfile.gettempdir()) / "Downloads" / "Test_videos"
+
+# define lightweight MPD element(AdaptationSet/Representation) attributes holder
+MPDElement = namedtuple(
+    "MPDElement", ["mime_type", "width", "height", "frame_rate", "audio_sampling_rate"]
+)
+
 
 def return_testvideo_path(fmt="av"):
     """
@@ -52,10 +64,13 @@ def return_testvideo_path(fmt="av"):
         "ao": "BigBuckBunny_4sec_AO.aac",
     }
     req_fmt = fmt if (fmt in supported_fmts) else "av"
-    path = "{}/Downloads/Test_videos/{}".format(
-        tempfile.gettempdir(), supported_fmts[req_fmt]
-    )
-    return os.path.abspath(path)
+    return str(_TESTVIDS / supported_fmts[req_fmt])
+
+
+# resolve test video paths only once at collection
+_AV = return_testvideo_path()
+_VO = return_testvideo_path(fmt="vo")
+_AO = return_testvideo_path(fmt="ao")
 
 
 def check_valid_mpd(file="", exp_reps=1):
@@ -66,13 +81,18 @@ def check_valid_mpd(file="", exp_reps=1):
         return False
     all_reprs = []
     all_adapts = []
+    mpd_attrs = ["mimeType", "width", "height", "frameRate", "audioSamplingRate"]
     try:
-        mpd = MPEGDASHParser.parse(file)
-        for period in mpd.periods:
-            for adapt_set in period.adaptation_sets:
-                all_adapts.append(adapt_set)
-                for rep in adapt_set.representations:
-                    all_reprs.append(rep)
+        for _, elem in ET.iterparse(file, events=("start",)):
+            # strip XML namespace from tag
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if not (tag in ["AdaptationSet", "Representation"]):
+                continue
+            attrs = MPDElement(*(elem.get(x) for x in mpd_attrs))
+            if tag == "AdaptationSet":
+                all_adapts.append(attrs)
+            else:
+                all_reprs.append(attrs)
     except Exception as e:
         logger.error(str(e))
         return False
@@ -89,15 +109,15 @@ def extract_meta_mpd(file):
         for rep in reprs:
             meta = {}
             meta["mime_type"] = rep.mime_type
-            if meta["mime_type"].startswith("audio"):
+            # extract media kind(i.e. `audio`/`video`) from mime-type
+            meta["kind"] = rep.mime_type.split("/", 1)[0]
+            if meta["kind"] == "audio":
                 meta["audioSamplingRate"] = rep.audio_sampling_rate
             else:
-                meta["width"] = rep.width
-                meta["height"] = rep.height
-                meta["framerate"] = (
-                    rep.frame_rate
-                    if not (rep.frame_rate is None)
-                    else adapts[0].frame_rate
+                meta["width"], meta["height"], meta["framerate"] = (
+                    rep.width,
+                    rep.height,
+                    rep.frame_rate or adapts[0].frame_rate,
                 )
             logger.debug("Found Meta: {}".format(meta))
             metas.append(meta)
@@ -107,13 +127,6 @@ def extract_meta_mpd(file):
         return []
 
 
-def return_mpd_path():
-    """
-    returns MPD assets temp path
-    """
-    return os.path.join(tempfile.gettempdir(), "temp_mpd")
-
-
 def string_to_float(value):
     """
     Converts fraction to float
@@ -121,9 +134,45 @@ def string_to_float(value):
     if value is None:
         logger.error("Input value is None!")
         return 0.0
-    extracted = value.strip().split("/")
-    cleaned = [float(x.strip()) for x in extracted]
-    return cleaned[0] / cleaned[1]
+    i = value.find("/")
+    return float(value) if i < 0 else float(value[:i]) / float(value[i + 1 :])
+
+
+@lru_cache(maxsize=4)
+def probe_resolution(source):
+    """
+    Probes source video resolution independently of StreamGear, only once per source
+    """
+    assert os.path.isfile(source), "Not a valid source"
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe:
+        # probe stream headers only with FFprobe
+        output = subprocess.check_output(
+            [
+                ffprobe,
+                "-v",
+                "error",
+                "-select_streams",
+                "v:0",
+                "-show_entries",
+                "stream=width,height",
+                "-of",
+                "json",
+                source,
+            ]
+        )
+        stream = json.loads(output)["streams"][0]
+        width, height = (stream["width"], stream["height"])
+    else:
+        # fallback to OpenCV
+        s_cv = cv2.VideoCapture(source)
+        width, height = (
+            s_cv.get(cv2.CAP_PROP_FRAME_WIDTH),
+            s_cv.get(cv2.CAP_PROP_FRAME_HEIGHT),
+        )
+        s_cv.release()
+    assert width and height, "Failed to retrieve source resolution"
+    return (int(width), int(height))
 
 
 def extract_resolutions(source, streams):
@@ -133,11 +182,8 @@ def extract_resolutions(source, streams):
     if not (source) or not (streams):
         return {}
     results = {}
-    assert os.path.isfile(source), "Not a valid source"
-    s_cv = cv2.VideoCapture(source)
-    results[int(s_cv.get(cv2.CAP_PROP_FRAME_WIDTH))] = int(
-        s_cv.get(cv2.CAP_PROP_FRAME_HEIGHT)
-    )
+    width, height = probe_resolution(source)
+    results[width] = height
     for stream in streams:
         if "-resolution" in stream:
             try:
@@ -154,14 +200,14 @@ def extract_resolutions(source, streams):
     return results
 
 
-def test_ss_stream():
+def test_ss_stream(tmp_path):
     """
     Testing Single-Source Mode
     """
-    mpd_file_path = os.path.join(return_mpd_path(), "dash_test.mpd")
+    mpd_file_path = str(tmp_path / "dash_test.mpd")
     try:
         stream_params = {
-            "-video_source": return_testvideo_path(),
+            "-video_source": _AV,
             "-clear_prev_assets": True,
         }
         streamer = StreamGear(output=mpd_file_path, logging=True, **stream_params)
@@ -172,14 +218,14 @@ def test_ss_stream():
         pytest.fail(str(e))
 
 
-def test_ss_livestream():
+def test_ss_livestream(tmp_path):
     """
     Testing Single-Source Mode with livestream.
     """
-    mpd_file_path = os.path.join(return_mpd_path(), "dash_test.mpd")
+    mpd_file_path = str(tmp_path / "dash_test.mpd")
     try:
         stream_params = {
-            "-video_source": return_testvideo_path(),
+            "-video_source": _AV,
             "-livestream": True,
             "-remove_at_exit": 1,
         }
@@ -191,32 +237,29 @@ def test_ss_livestream():
 
 
 @pytest.mark.parametrize("conversion", [None, "COLOR_BGR2GRAY", "COLOR_BGR2BGRA"])
-def test_rtf_stream(conversion):
+def test_rtf_stream(conversion, tmp_path):
     """
     Testing Real-Time Frames Mode
     """
-    mpd_file_path = return_mpd_path()
+    mpd_file_path = str(tmp_path)
     try:
-        # Open stream
-        options = {"THREAD_TIMEOUT": 300}
-        stream = CamGear(
-            source=return_testvideo_path(), colorspace=conversion, **options
-        ).start()
+        stream = cv2.VideoCapture(_AV)  # Open stream
         stream_params = {
             "-clear_prev_assets": True,
             "-input_framerate": "invalid",
         }
         streamer = StreamGear(output=mpd_file_path, **stream_params)
         while True:
-            frame = stream.read()
-            # check if frame is None
-            if frame is None:
+            (grabbed, frame) = stream.read()
+            if not grabbed:
                 break
+            if not (conversion is None):
+                frame = cv2.cvtColor(frame, getattr(cv2, conversion))
             if conversion == "COLOR_BGR2RGBA":
                 streamer.stream(frame, rgb_mode=True)
             else:
                 streamer.stream(frame)
-        stream.stop()
+        stream.release()
         streamer.terminate()
         mpd_file = [
             os.path.join(mpd_file_path, f)
@@ -226,55 +269,53 @@ def test_rtf_stream(conversion):
         assert len(mpd_file) == 1, "Failed to create MPD file!"
         assert check_valid_mpd(mpd_file[0])
     except Exception as e:
-        if not isinstance(e, queue.Empty):
-            pytest.fail(str(e))
+        pytest.fail(str(e))
 
 
-def test_rtf_livestream():
+def test_rtf_livestream(tmp_path):
     """
     Testing Real-Time Frames Mode with livestream.
     """
-    mpd_file_path = return_mpd_path()
+    mpd_file_path = str(tmp_path)
     try:
-        # Open stream
-        options = {"THREAD_TIMEOUT": 300}
-        stream = CamGear(source=return_testvideo_path(), **options).start()
+        stream = cv2.VideoCapture(_AV)  # Open stream
         stream_params = {
             "-livestream": True,
         }
         streamer = StreamGear(output=mpd_file_path, **stream_params)
         while True:
-            frame = stream.read()
-            # check if frame is None
-            if frame is None:
+            (grabbed, frame) = stream.read()
+            if not grabbed:
                 break
             streamer.stream(frame)
-        stream.stop()
+        stream.release()
         streamer.terminate()
     except Exception as e:
-        if not isinstance(e, queue.Empty):
-            pytest.fail(str(e))
+        pytest.fail(str(e))
 
 
-def test_input_framerate_rtf():
+def test_input_framerate_rtf(tmp_path):
     """
     Testing "-input_framerate" parameter provided by StreamGear
     """
     try:
-        mpd_file_path = os.path.join(return_mpd_path(), "dash_test.mpd")
-        stream = cv2.VideoCapture(return_testvideo_path())  # Open stream
+        mpd_file_path = str(tmp_path / "dash_test.mpd")
+        stream = cv2.VideoCapture(_AV)  # Open stream
         test_framerate = stream.get(cv2.CAP_PROP_FPS)
+        total_frames = int(stream.get(cv2.CAP_PROP_FRAME_COUNT))
+        assert total_frames > 0, "Failed to read frame count!"
+        # only frame-rate is checked, so decode just the first frame
+        (grabbed, frame) = stream.read()
+        stream.release()
+        assert grabbed, "Failed to read test video!"
         stream_params = {
             "-clear_prev_assets": True,
             "-input_framerate": test_framerate,
         }
         streamer = StreamGear(output=mpd_file_path, logging=True, **stream_params)
-        while True:
-            (grabbed, frame) = stream.read()
-            if not grabbed:
-                break
+        # feed same frame for source's duration
+        for _ in range(total_frames):
             streamer.stream(frame)
-        stream.release()
         streamer.terminate()
         meta_data = extract_meta_mpd(mpd_file_path)
         assert meta_data and len(meta_data) > 0, "Test Failed!"
@@ -299,13 +340,13 @@ def test_input_framerate_rtf():
         },
     ],
 )
-def test_params(stream_params):
+def test_params(stream_params, tmp_path):
     """
     Testing "-input_framerate" parameter provided by StreamGear
     """
     try:
-        mpd_file_path = os.path.join(return_mpd_path(), "dash_test.mpd")
-        stream = cv2.VideoCapture(return_testvideo_path())  # Open stream
+        mpd_file_path = str(tmp_path / "dash_test.mpd")
+        stream = cv2.VideoCapture(_AV)  # Open stream
         streamer = StreamGear(output=mpd_file_path, logging=True, **stream_params)
         while True:
             (grabbed, frame) = stream.read()
@@ -324,26 +365,26 @@ def test_params(stream_params):
     [
         {
             "-clear_prev_assets": True,
-            "-video_source": return_testvideo_path(fmt="vo"),
+            "-video_source": _VO,
             "-audio": "https://raw.githubusercontent.com/abhiTronix/Imbakup/master/Images/invalid.aac",
         },
         {
             "-clear_prev_assets": True,
-            "-video_source": return_testvideo_path(fmt="vo"),
-            "-audio": return_testvideo_path(fmt="ao"),
+            "-video_source": _VO,
+            "-audio": _AO,
         },
         {
             "-clear_prev_assets": True,
-            "-video_source": return_testvideo_path(fmt="vo"),
+            "-video_source": _VO,
             "-audio": "https://raw.githubusercontent.com/abhiTronix/Imbakup/master/Images/big_buck_bunny_720p_1mb_ao.aac",
         },
     ],
 )
-def test_audio(stream_params):
+def test_audio(stream_params, tmp_path):
     """
     Testing Single-Source Mode
     """
-    mpd_file_path = os.path.join(return_mpd_path(), "dash_test.mpd")
+    mpd_file_path = str(tmp_path / "dash_test.mpd")
     try:
         streamer = StreamGear(output=mpd_file_path, logging=True, **stream_params)
         streamer.transcode_source()
@@ -358,7 +399,7 @@ def test_audio(stream_params):
     [
         {
             "-clear_prev_assets": True,
-            "-video_source": return_testvideo_path(fmt="vo"),
+            "-video_source": _VO,
             "-streams": [
                 {
                     "-video_bitrate": "unknown",
@@ -382,8 +423,8 @@ def test_audio(stream_params):
         },
         {
             "-clear_prev_assets": True,
-            "-video_source": return_testvideo_path(fmt="vo"),
-            "-audio": return_testvideo_path(fmt="ao"),
+            "-video_source": _VO,
+            "-audio": _AO,
             "-streams": [
                 {
                     "-resolution": "640x480",
@@ -398,7 +439,7 @@ def test_audio(stream_params):
         },
         {
             "-clear_prev_assets": True,
-            "-video_source": return_testvideo_path(),
+            "-video_source": _AV,
             "-streams": [
                 {
                     "-resolution": "960x540",
@@ -408,11 +449,11 @@ def test_audio(stream_params):
         },
     ],
 )
-def test_multistreams(stream_params):
+def test_multistreams(stream_params, tmp_path):
     """
     Testing Support for additional Secondary Streams of variable bitrates or spatial resolutions.
     """
-    mpd_file_path = os.path.join(return_mpd_path(), "dash_test.mpd")
+    mpd_file_path = str(tmp_path / "dash_test.mpd")
     results = extract_resolutions(
         stream_params["-video_source"], stream_params["-streams"]
     )
@@ -421,7 +462,7 @@ def test_multistreams(stream_params):
         streamer.transcode_source()
         streamer.terminate()
         metadata = extract_meta_mpd(mpd_file_path)
-        meta_videos = [x for x in metadata if x["mime_type"].startswith("video")]
+        meta_videos = [x for x in metadata if x["kind"] == "video"]
         assert meta_videos and (len(meta_videos) <= len(results)), "Test Failed!"
         for s_v in meta_videos:
             assert int(s_v["width"]) in results, "Width check failed!"